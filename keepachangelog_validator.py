@@ -1,54 +1,45 @@
 import re
-import datetime
 import argparse
+import collections
+import functools
+import io
+import mmap
 import os
-from typing import List, Dict, Any
-
-
-class Version:
+import stat
+import sys
+from typing import AbstractSet, List, Dict, Any, NamedTuple, Optional, Sequence, Tuple
+
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}", re.ASCII)
+# One alternative per kind of header line, dispatched on through Match.lastgroup
+_LINE_RE = re.compile(
+    r"^(?:(?P<head># Changelog)"
+    r"|### (?P<section>.*)"
+    r"|(?P<heading>###.*)"
+    r"|(?P<unreleased>## \[Unreleased\]).*"
+    r"|(?P<release>## \[(?P<version>\d+\.\d+\.\d+)\] - (?P<date>\d{4}-\d{2}-\d{2}))[^\S\n]*$"
+    r"|(?P<other>##.*))",
+    re.MULTILINE | re.ASCII,
+)
+_SKIPPED_DIRS = frozenset((".git", "node_modules"))
+# Ordered names for messages, set for lookups
+_ALLOWED_SECTION_NAMES = ('Added', 'Changed', 'Fixed', 'Deprecated', 'Removed')
+_ALLOWED_SECTIONS = frozenset(map(sys.intern, _ALLOWED_SECTION_NAMES))
+
+
+class Version(NamedTuple):
     """
     Represents a version in the changelog.
-    """
-
-    def __init__(self, version: str, date: str, sections: List[Dict[str, Any]]):
-        """
-        Initializes a Version object.
-
-        Args:
-            version: The version string.
-            date: The release date string.
-            sections: The list of sections in the version.
-        """
-        self._version = version
-        self._date = date
-        self._sections = sections
 
-    def version(self) -> str:
-        """
-        Returns the version string.
-        """
-        return self._version
-
-    def date(self) -> str:
-        """
-        Returns the release date string.
-        """
-        return self._date
-
-    def sections(self) -> List[Dict[str, Any]]:
-        """
-        Returns the list of sections in the version.
-        """
-        return self._sections
-
-    def has_link_reference(self) -> bool:
-        """
-        Checks if the version has a link reference.
-
-        Returns:
-            True if the version has a link reference, False otherwise.
-        """
-        return True  # Modify this if you have a way to check for link references
+    Attributes:
+        version: The version string.
+        date: The release date string.
+        sections: The list of sections in the version.
+        has_link_reference: True if the version has a link reference.
+    """
+    version: str
+    date: str
+    sections: List[Dict[str, Any]]
+    has_link_reference: bool = True  # Modify this if you have a way to check for link references
 
 
 class KACLValidator:
@@ -68,10 +59,7 @@ class KACLValidator:
         Returns:
             True if the version string is a valid semantic version, False otherwise.
         """
-        regex = KACLValidator.semver_regex
-        if not re.match(regex, version):
-            return False
-        return True
+        return _SEMVER_RE.fullmatch(version) is not None
 
     @staticmethod
     def verify_date(date: str) -> bool:
@@ -86,18 +74,16 @@ class KACLValidator:
         """
         if not date or len(date) < 1:
             return False
-        if not re.match(r"\d{4}-\d{2}-\d{2}", date):
-            return False
-        return True
+        return _DATE_RE.fullmatch(date) is not None
 
     @staticmethod
-    def verify_sections(sections: List[Dict[str, Any]], allowed_sections: List[str]) -> bool:
+    def verify_sections(sections: List[Dict[str, Any]], allowed_sections: AbstractSet[str]) -> bool:
         """
         Verifies if the sections in the given list are valid.
 
         Args:
             sections: The list of sections.
-            allowed_sections: The list of allowed section names.
+            allowed_sections: The set of allowed section names.
 
         Returns:
             True if all sections are valid, False otherwise.
@@ -123,64 +109,77 @@ class KACLValidator:
         return True  # Modify this if you have a way to check for link references
 
     @staticmethod
-    def verify_version(version: Version, allowed_sections: List[str]) -> List[str]:
+    def verify_version(version: Version, allowed_sections: AbstractSet[str],
+                       section_order: Optional[Sequence[str]] = None) -> List[str]:
         """
         Verifies a version against the Keep a Changelog format.
 
         Args:
             version: The Version object to verify.
-            allowed_sections: The list of allowed section names.
+            allowed_sections: The set of allowed section names.
+            section_order: The allowed section names in the order listed in error messages.
+                Defaults to the sorted names of allowed_sections.
 
         Returns:
             A list of error messages. An empty list indicates no errors.
         """
-        errors = []
+        # The sections check prints its diagnostic, so it runs on every call; only its result is memoized
+        sections_valid = KACLValidator.verify_sections(version.sections, allowed_sections)
+        if section_order is None:
+            section_order = sorted(allowed_sections)
+        return list(_verify_version_cached(
+            version.version, version.date, sections_valid, tuple(section_order), version.has_link_reference
+        ))
+
+
+@functools.lru_cache(maxsize=1024)
+def _verify_version_cached(version: str, date: str, sections_valid: bool,
+                           section_order: Tuple[str, ...], has_link_reference: bool) -> Tuple[str, ...]:
+    """
+    Runs the remaining KACLValidator.verify_version checks, memoized on their hashable inputs.
+    It does no I/O, so a cache hit returns the same result a fresh call would.
+    """
+    errors = []
 
-        if not KACLValidator.verify_semver(version.version()):
-            errors.append(f"Version {version.version()} is not a valid semantic version.")
+    if not KACLValidator.verify_semver(version):
+        errors.append(f"Version {version} is not a valid semantic version.")
 
-        if not KACLValidator.verify_date(version.date()):
-            errors.append(f"Version {version.version()} has an invalid release date format.")
+    if not KACLValidator.verify_date(date):
+        errors.append(f"Version {version} has an invalid release date format.")
 
-        if not KACLValidator.verify_sections(version.sections(), allowed_sections):
-            sections_str = ", ".join(allowed_sections)
-            errors.append(
-                f"Version {version.version()} contains an invalid section. "
-                f"Valid sections are: {sections_str}"
-            )
+    if not sections_valid:
+        sections_str = ", ".join(section_order)
+        errors.append(
+            f"Version {version} contains an invalid section. "
+            f"Valid sections are: {sections_str}"
+        )
 
-        if not KACLValidator.verify_links(version.has_link_reference()):
-            errors.append(
-                f"Version {version.version()} is linked, but no link reference found in the changelog."
-            )
+    if not KACLValidator.verify_links(has_link_reference):
+        errors.append(
+            f"Version {version} is linked, but no link reference found in the changelog."
+        )
 
-        return errors
+    return tuple(errors)
 
 
-def parse_changelog(changelog_content: str, allowed_sections: List[str]) -> List[Dict[str, Any]]:
-    """
-    Parses the changelog content and returns a list of versions with sections.
+_SEMVER_RE = re.compile(KACLValidator.semver_regex, re.ASCII)
 
-    Args:
-        changelog_content: The content of the changelog.
-        allowed_sections: The list of allowed section names.
 
-    Returns:
-        A list of dictionaries representing the versions in the changelog, each with a version, date, and sections.
+def _version_key(version: str) -> Tuple[int, ...]:
+    """
+    Returns the M.m.p version as a tuple of ints, so versions compare numerically.
+    """
+    return tuple(map(int, version.split(".")))
+
+def _build_section(title: str, body: str) -> Dict[str, Any]:
     """
-    changelog = []
-    versions = re.findall(r'## \[(.*?)\] - (\d{4}-\d{2}-\d{2})', changelog_content)
-    for version, date in versions:
-        sections = re.findall(r'### (.*?)\n(.*?)(?=\n###|\Z)', changelog_content, re.DOTALL)
-        parsed_sections = []
-        for title, changes in sections:
-            if title.strip() in allowed_sections:
-                parsed_sections.append({'section': title.strip(), 'changes': changes.strip().split('\n- ')})
-            else:
-                print('\033[93m', "Not allowed section:", title, '\033[0m')
-                return []
-        changelog.append({'version': version, 'date': date, 'sections': parsed_sections})
-    return changelog
+    Builds a section dictionary from its title and the text from the end of its header line.
+    """
+    # The body starts with the header's newline, so every change item follows a "\n- "
+    changes = body.split('\n- ')[1:]
+    if changes:
+        changes[-1] = changes[-1].rstrip()
+    return {'section': title, 'changes': changes}
 
 def compare_versions_order(version1:str, version2:str)-> bool:
     """
@@ -193,87 +192,151 @@ def compare_versions_order(version1:str, version2:str)-> bool:
     Returns:
         True if the version 1 is higher than version 2.
     """
-    v1 = list(map(int, version1.split(".")))
-    v2 = list(map(int, version2.split(".")))
-    # Compare each version element
-    for i in range(len(v1)):
-        if v1[i] > v2[i]:
-            return True
-        elif v1[i] < v2[i]:
-            return False
-    # All elements are equal
-    return False
+    return _version_key(version1) > _version_key(version2)
 
-def verify_changelog_format(changelog_content: str) -> bool:
+def parse_and_validate(changelog_content: str, allowed_sections: AbstractSet[str]) -> Tuple[List[str], List[Version]]:
     """
-    Verifies the format of the changelog content.
+    Verifies the format of the changelog content and parses its versions in a single pass.
 
     Args:
         changelog_content: The content of the changelog.
+        allowed_sections: The set of allowed section names.
 
     Returns:
-        True if the format is valid, False otherwise.
+        A tuple with the list of format error messages (empty if the format is valid)
+        and the list of Version objects found in the changelog, newest first.
     """
-    # Check section "Changelog"
-    if not re.search(r"# Changelog", changelog_content):
-        print("No 'Changelog' header found.")
-        return False
-
-    # Check section "Unreleased"
-    if not re.search(r"## \[Unreleased\]", changelog_content):
-        print("'Unreleased' section is missing from the Changelog.")
-        return False
-
-    content_lines = changelog_content.split("\n")
-
-    # Check the format "## [M.m.p] - YYYY-MM-DD"
-    for line in content_lines:
-        if line.startswith('##') and "[Unreleased]" not in line and "###" not in line:
-            version_match = re.match(r'## \[(\d+\.\d+\.\d+)\] - (\d{4}-\d{2}-\d{2})$', line.strip())
-            if not version_match:
-                print('\033[93m', "Format not allowed:", line, '\033[0m')
-                return False
-
-    # check versions, dates order
-    pattern = r"## \[(\d+\.\d+\.\d+)\] - (\d{4}-\d{2}-\d{2})"
-    matches = re.findall(pattern, changelog_content)
-
-    if len(matches) == 1:
-        print("Bypass the chronological order check since we seem to have only one version.")
-        return True
-
-    if len(matches) < 2:
-        print("Versions need to be defined with a release date in the following format 'YYYY-MM-DD'")
-        return False
-
-    for i in range(1, len(matches)):
-        version_current = matches[i][0]
-        version_previous = matches[i - 1][0]
-
-        date_current = datetime.datetime.strptime(matches[i][1], "%Y-%m-%d")
-        date_previous = datetime.datetime.strptime(matches[i - 1][1], "%Y-%m-%d")
-
-        if compare_versions_order(version_current, version_previous):
-            print("Versions are not in descending order. v1:", version_current, "v2:", version_previous)
-            return False
-
-        if date_current > date_previous:
-            print("Dates are not in chronological order. t1:", date_current, "t2:", date_previous)
-            return False
-
-    return True
+    seen_changelog_header = False
+    seen_unreleased = False
+    format_error = None
+    order_error = None
+    section_error = None
+    previous = None
+    versions = []
+    # Sections outside a release (preamble, Unreleased) are validated, then dropped
+    sections = []
+    title = None
+    body_start = 0
+
+    # Single pass: one scan finds every header line, the text in between is section content
+    for line_match in _LINE_RE.finditer(changelog_content):
+        kind = line_match.lastgroup
+        if kind == "head":
+            seen_changelog_header = True
+            continue
+
+        # Any "##" line ends the current section
+        if title is not None:
+            sections.append(_build_section(title, changelog_content[body_start:line_match.start()]))
+            title = None
+
+        if kind == "section":
+            # Interned titles let the set lookups below short-circuit on identity
+            title = sys.intern(line_match["section"].strip())
+            body_start = line_match.end()
+            if title not in allowed_sections and section_error is None:
+                section_error = line_match["section"]
+            continue
+
+        # Deeper headings such as "#### Details" are not allowed sections either
+        if kind == "heading":
+            if section_error is None:
+                section_error = line_match["heading"].lstrip("#").strip()
+            continue
+
+        sections = []
+        if kind == "unreleased":
+            seen_unreleased = True
+            continue
+
+        # Check the format "## [M.m.p] - YYYY-MM-DD"
+        if kind == "other":
+            if format_error is None:
+                format_error = line_match["other"]
+            continue
+
+        # check versions, dates order
+        version_current, date_current = line_match["version"], line_match["date"]
+        # Parse each version once; "YYYY-MM-DD" dates already sort chronologically as strings
+        current = (_version_key(version_current), version_current, date_current)
+        if previous is not None and order_error is None:
+            _, version_previous, date_previous = previous
+
+            if current[0] > previous[0]:
+                order_error = f"Versions are not in descending order. v1: {version_current} v2: {version_previous}"
+            elif date_current > date_previous:
+                order_error = f"Dates are not in chronological order. t1: {date_current} t2: {date_previous}"
+        previous = current
+        versions.append(Version(version_current, date_current, sections))
+
+    if title is not None:
+        sections.append(_build_section(title, changelog_content[body_start:]))
+
+    errors = []
+    if not seen_changelog_header:
+        errors.append("No 'Changelog' header found.")
+
+    if not seen_unreleased:
+        errors.append("'Unreleased' section is missing from the Changelog.")
+
+    if format_error is not None:
+        errors.append(f"\033[93m Format not allowed: {format_error} \033[0m")
+
+    if not versions:
+        errors.append("Versions need to be defined with a release date in the following format 'YYYY-MM-DD'")
+
+    if order_error is not None:
+        errors.append(order_error)
+
+    if section_error is not None:
+        errors.append(f"\033[93m Not allowed section: {section_error} \033[0m")
+
+    return errors, versions
 
 def find_changelog_file():
     """
     Find the first changelog file in the current directory.
     """
-    current_dir = os.getcwd()
-    for root, dirs, files in os.walk(current_dir):
-        for file in files:
-            if file.lower() == "changelog.md":
-                return os.path.join(root, file)
+    # Breadth-first, so the changelog closest to the current directory wins
+    pending = collections.deque([os.getcwd()])
+    while pending:
+        try:
+            entries = os.scandir(pending.popleft())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SKIPPED_DIRS:
+                        pending.append(entry.path)
+                elif entry.name.lower() == "changelog.md" and entry.is_file():
+                    return entry.path
     return None
 
+def read_changelog(path: str) -> str:
+    """
+    Reads the changelog file, through a read-only memory map when it is a non-empty regular file.
+
+    Args:
+        path: Path to the changelog file.
+
+    Returns:
+        The UTF-8 decoded content without a leading byte order mark, with line endings normalized to '\\n'.
+    """
+    with open(path, 'rb') as file:
+        file_stat = os.fstat(file.fileno())
+        # Pipes, FIFOs and empty files cannot be mapped
+        if stat.S_ISREG(file_stat.st_mode) and file_stat.st_size > 0:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                content = str(mapped, 'utf-8-sig')
+                if mapped.find(b"\r") != -1:
+                    content = content.replace("\r\n", "\n").replace("\r", "\n")
+            return content
+
+        # Decode from the same handle, a pipe cannot be reopened to read it again
+        with io.TextIOWrapper(file, encoding='utf-8-sig') as text_file:
+            return text_file.read()
+
 def main():
     """
     Entry point of the script.
@@ -294,38 +357,39 @@ def main():
             exit(1)
         changelog_file = args.file
 
-    allowed_sections = ['Added', 'Changed', 'Fixed', 'Deprecated', 'Removed']
+    allowed_section_names = _ALLOWED_SECTION_NAMES
+    allowed_sections = _ALLOWED_SECTIONS
 
-    with open(changelog_file, 'r', encoding='utf-8') as file:
-        changelog_content = file.read()
-
-    if not verify_changelog_format(changelog_content):
-        print('Changelog format is invalid.')
-        exit(1)
+    changelog_content = read_changelog(changelog_file)
 
-    changelog = parse_changelog(changelog_content, allowed_sections)
+    errors, changelog = parse_and_validate(changelog_content, allowed_sections)
 
-    if not changelog:
-        print("Issue with changelog parsing")
+    if errors:
+        for error in errors:
+            print(error)
+        print('Changelog format is invalid.')
         exit(1)
 
-    for version_data in changelog:
-        version = version_data['version']
-        date = version_data['date']
-        sections = version_data['sections']
+    if len(changelog) == 1:
+        print("Bypass the chronological order check since we seem to have only one version.")
 
-        version_obj = Version(version, date, sections)
+    # Collect the report and write it in one go instead of one print per line
+    out_lines = []
+    for version_obj in changelog:
+        version = version_obj.version
 
         # Verify the version
-        errors = KACLValidator.verify_version(version_obj, allowed_sections)
+        errors = KACLValidator.verify_version(version_obj, allowed_sections, allowed_section_names)
 
         if errors:
-            print(f"Errors found in version {version}:")
-            for error in errors:
-                print(f"- {error}")
+            out_lines.append(f"Errors found in version {version}:")
+            out_lines.extend(f"- {error}" for error in errors)
+            sys.stdout.write("\n".join(out_lines) + "\n")
             exit(1)
         else:
-            print(f"Version {version} is valid.")
+            out_lines.append(f"Version {version} is valid.")
+
+    sys.stdout.write("\n".join(out_lines) + "\n")
 
 
 if __name__ == "__main__":